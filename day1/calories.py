@@ -0,0 +1,782 @@
+"""
+Aggregation of the elves' calorie inventories.
+
+* The streaming functions read the inventory one line at a time rather than loading the whole file into memory,
+  so they can be used on inventory dumps which are far larger than the puzzle input.
+* The vectorised functions parse the whole file at once with NumPy, keeping the work out of the interpreter loop.
+* The parallel functions split the file into byte ranges which are aggregated in a process pool.
+* :class:`~.InventoryFollower` keeps the leaderboard up to date as lines are appended to the inventory.
+* :class:`~.CalorieIndex` answers rank and percentile queries over the totals.
+* :func:`~.merge_calories` combines the leaderboards of several inventory files.
+* The columnar functions store a parsed inventory in a compact binary file which can be memory mapped,
+  so repeat runs over the same inventory skip parsing the text entirely.
+"""
+
+# stdlib
+import bisect
+import heapq
+import os
+import re
+import struct
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+# 3rd party
+import numpy
+from domdf_python_tools.typing import PathLike
+
+__all__ = [
+		"CalorieIndex",
+		"ChunkSummary",
+		"InventoryFollower",
+		"Leaderboard",
+		"cached_calories",
+		"chunk_boundaries",
+		"columnar_totals",
+		"elf_offsets",
+		"elf_totals",
+		"follow_calories",
+		"iter_elf_totals",
+		"load_columnar",
+		"merge_calories",
+		"parallel_calories",
+		"parse_inventory",
+		"save_columnar",
+		"stitch_chunks",
+		"stream_calories",
+		"summarise_chunk",
+		"vectorised_calories",
+		]
+
+_NEWLINE = ord('\n')
+
+# Whitespace other than newlines, which is stripped from around each item.
+_LINE_WHITESPACE = b" \t\r\v\f"
+
+# The bytes which may remain once that whitespace is removed, and a pattern to find any others.
+_ITEM_BYTES = b"0123456789\n"
+_UNEXPECTED_RE = re.compile(rb"[^0-9\s]")
+
+# 18 digits is the most an int64 is guaranteed to hold without overflowing.
+_MAX_DIGITS = 18
+
+# The columnar file starts with a magic number followed by the number of items and the number of elves.
+_COLUMNAR_MAGIC = b"ELFCAL\x00\x01"
+_COLUMNAR_HEADER = struct.Struct("<8sqq")
+_COLUMNAR_DTYPE = numpy.dtype("<i8")
+
+
+def iter_elf_totals(lines: Iterable[str]) -> Iterator[int]:
+	"""
+	Sum each elf's items as the lines are read, yielding each elf's total once their inventory ends.
+
+	:param lines: The lines of the inventory. Each elf's items are separated from the next elf's by a blank line.
+	"""
+
+	total = 0
+	has_items = False
+
+	for line in lines:
+		line = line.strip()
+		if line:
+			total += int(line)
+			has_items = True
+		elif has_items:
+			yield total
+			total = 0
+			has_items = False
+
+	if has_items:
+		yield total
+
+
+class Leaderboard:
+	"""
+	Keeps the ``n`` largest calorie totals seen so far, using a bounded min-heap.
+
+	:param n: The number of totals to keep.
+	"""
+
+	def __init__(self, n: int = 3):
+		if n < 1:
+			raise ValueError("'n' must be at least 1")
+
+		self.n = n
+		self._heap: List[int] = []
+
+	def push(self, total: int) -> None:
+		"""
+		Add an elf's total to the leaderboard, displacing the smallest total if the leaderboard is full.
+
+		:param total:
+		"""
+
+		if len(self._heap) < self.n:
+			heapq.heappush(self._heap, total)
+		elif total > self._heap[0]:
+			heapq.heapreplace(self._heap, total)
+
+	def extend(self, totals: Iterable[int]) -> None:
+		"""
+		Add several elves' totals to the leaderboard.
+
+		:param totals:
+		"""
+
+		for total in totals:
+			self.push(total)
+
+	def top(self, n: Union[int, None] = None) -> List[int]:
+		"""
+		Returns the largest totals, in descending order.
+
+		:param n: The number of totals to return. Defaults to the size of the leaderboard.
+		"""
+
+		if n is None:
+			n = self.n
+		elif n > self.n:
+			raise ValueError(f"Only the top {self.n} totals are being kept")
+
+		return sorted(self._heap, reverse=True)[:n]
+
+	@property
+	def max(self) -> int:
+		"""
+		The largest total seen so far.
+		"""
+
+		if not self._heap:
+			raise ValueError("No totals have been added to the leaderboard")
+
+		return max(self._heap)
+
+	@classmethod
+	def merge(cls, leaderboards: Sequence["Leaderboard"], n: Optional[int] = None) -> "Leaderboard":
+		"""
+		Combine several leaderboards into one with a k-way merge of their (descending) totals.
+
+		:param leaderboards:
+		:param n: The number of totals to keep. Defaults to the largest size of the leaderboards being merged.
+		"""
+
+		if n is None:
+			n = max((leaderboard.n for leaderboard in leaderboards), default=3)
+
+		merged = cls(n)
+		merged.extend(islice(heapq.merge(*(leaderboard.top() for leaderboard in leaderboards), reverse=True), n))
+
+		return merged
+
+	def __len__(self) -> int:
+		return len(self._heap)
+
+	def __repr__(self) -> str:
+		return f"{self.__class__.__name__}(n={self.n}, top={self.top()})"
+
+
+def stream_calories(filename: PathLike, n: int = 3) -> Leaderboard:
+	"""
+	Read the inventory in ``filename`` line by line, keeping only the ``n`` largest elf totals.
+
+	Memory use is proportional to ``n`` rather than to the size of the file.
+
+	:param filename:
+	:param n: The number of totals to keep.
+	"""
+
+	leaderboard = Leaderboard(n)
+
+	with open(filename, encoding="UTF-8") as fp:
+		leaderboard.extend(iter_elf_totals(fp))
+
+	return leaderboard
+
+
+def merge_calories(filenames: Iterable[PathLike], n: int = 3) -> Leaderboard:
+	"""
+	Find the ``n`` largest elf totals across several inventory files.
+
+	Each file is streamed into its own bounded leaderboard, and the leaderboards are then k-way merged,
+	so no file is ever loaded into memory in full. An elf's inventory never continues from one file into the next.
+
+	:param filenames:
+	:param n: The number of totals to keep.
+	"""
+
+	return Leaderboard.merge([stream_calories(filename, n) for filename in filenames], n)
+
+
+def parse_inventory(buffer: bytes) -> Tuple[numpy.ndarray, numpy.ndarray]:
+	"""
+	Parse the whole inventory into an array of item calories and an array of the elf each item belongs to.
+
+	Elves are numbered from zero in the order they appear in the inventory.
+
+	:param buffer: The raw contents of the inventory file.
+
+	:returns: A tuple of ``(items, elf_ids)``, both of which are ``int64`` arrays.
+	"""
+
+	# Whitespace around an item is ignored, as it is by int(), so removing it leaves only digits and newlines.
+	compact = buffer.translate(None, _LINE_WHITESPACE)
+	if compact.translate(None, _ITEM_BYTES):
+		match = _UNEXPECTED_RE.search(buffer)
+		assert match is not None
+		raise ValueError(f"Unexpected character {match[0]!r} at byte {match.start()}")
+
+	if not compact.endswith(b'\n'):
+		compact += b'\n'
+
+	line_ends = numpy.flatnonzero(numpy.frombuffer(compact, dtype=numpy.uint8) == _NEWLINE)
+	line_lengths = numpy.diff(line_ends, prepend=-1) - 1
+
+	if line_lengths.max(initial=0) > _MAX_DIGITS:
+		raise ValueError(f"Items with more than {_MAX_DIGITS} digits are not supported")
+
+	is_item = line_lengths > 0
+	n_items = int(numpy.count_nonzero(is_item))
+
+	# Every blank line ends the current elf's inventory; runs of blank lines are collapsed below.
+	blank_lines_before = numpy.cumsum(~is_item)[is_item]
+	new_elf = numpy.empty(blank_lines_before.size, dtype=bool)
+	new_elf[:1] = True
+	numpy.not_equal(blank_lines_before[1:], blank_lines_before[:-1], out=new_elf[1:])
+	elf_ids = numpy.cumsum(new_elf, dtype=numpy.int64) - 1
+
+	if not n_items:
+		return numpy.empty(0, dtype=numpy.int64), elf_ids
+
+	with warnings.catch_warnings():
+		# Some versions of NumPy only warn, rather than raising an error, if the whole string cannot be parsed.
+		warnings.simplefilter("ignore", DeprecationWarning)
+		items = numpy.fromstring(buffer, dtype=numpy.int64, sep=' ')
+
+	# Every non-blank line holds only digits and whitespace, so it yields at least one item;
+	# any extra items must come from whitespace between the digits on a line.
+	if items.size != n_items:
+		raise ValueError("Each line must contain at most one item")
+
+	return items, elf_ids
+
+
+def elf_totals(items: numpy.ndarray, elf_ids: numpy.ndarray) -> numpy.ndarray:
+	"""
+	Sum the items belonging to each elf with a single segmented reduction.
+
+	:param items: The calories of each item.
+	:param elf_ids: The (non-decreasing) elf each item belongs to, as returned by :func:`~.parse_inventory`.
+	"""
+
+	return columnar_totals(items, elf_offsets(elf_ids))
+
+
+def vectorised_calories(filename: PathLike) -> numpy.ndarray:
+	"""
+	Returns the total calories carried by each elf in ``filename``, in the order the elves appear.
+
+	:param filename:
+	"""
+
+	with open(filename, "rb") as fp:
+		buffer = fp.read()
+
+	return elf_totals(*parse_inventory(buffer))
+
+
+class ChunkSummary(NamedTuple):
+	"""
+	The elf totals found in one byte range of the inventory.
+
+	The items before the first blank line in the range may belong to an elf which started in an earlier range,
+	and the items after the last blank line may belong to an elf which continues into a later range,
+	so they are kept separately to be stitched together by :func:`~.stitch_chunks`.
+	"""
+
+	#: The sum of the items before the first blank line (or of every item, if there is no blank line).
+	leading: int
+
+	#: Whether there were any items before the first blank line.
+	leading_has_items: bool
+
+	#: The totals of the elves whose inventories lie wholly within the range.
+	totals: List[int]
+
+	#: The sum of the items after the last blank line.
+	trailing: int
+
+	#: Whether there were any items after the last blank line.
+	trailing_has_items: bool
+
+	#: Whether the range contains at least one blank line.
+	has_separator: bool
+
+
+def chunk_boundaries(filename: PathLike, chunk_size: int) -> List[Tuple[int, int]]:
+	"""
+	Divide ``filename`` into byte ranges of approximately ``chunk_size`` bytes.
+
+	Each range is moved forward to start at the beginning of a line, so no line is split between two ranges.
+
+	:param filename:
+	:param chunk_size:
+
+	:returns: A list of ``(start, end)`` offsets.
+	"""
+
+	if chunk_size < 1:
+		raise ValueError("'chunk_size' must be at least 1")
+
+	file_size = os.path.getsize(filename)
+	starts = [0]
+
+	with open(filename, "rb") as fp:
+		for offset in range(chunk_size, file_size, chunk_size):
+			# Step back one byte so an offset which is already at the start of a line stays put.
+			fp.seek(offset - 1)
+			fp.readline()
+			line_start = fp.tell()
+			if starts[-1] < line_start < file_size:
+				starts.append(line_start)
+
+	return list(zip(starts, [*starts[1:], file_size]))
+
+
+def summarise_chunk(filename: PathLike, start: int, end: int) -> ChunkSummary:
+	"""
+	Aggregate the elf totals in the given byte range of ``filename``.
+
+	:param filename:
+	:param start: The offset of the start of the range, which must be at the start of a line.
+	:param end: The offset of the end of the range (exclusive).
+	"""
+
+	with open(filename, "rb") as fp:
+		fp.seek(start)
+		lines = fp.read(end - start).split(b'\n')
+
+	# A range ending with a newline yields an empty string after the final split.
+	if len(lines) > 1 and not lines[-1]:
+		lines.pop()
+
+	leading: Optional[Tuple[int, bool]] = None
+	totals = []
+	total = 0
+	has_items = False
+
+	for line in lines:
+		line = line.strip()
+		if line:
+			total += int(line)
+			has_items = True
+			continue
+
+		if leading is None:
+			leading = (total, has_items)
+		elif has_items:
+			totals.append(total)
+
+		total = 0
+		has_items = False
+
+	if leading is None:
+		return ChunkSummary(total, has_items, [], 0, False, False)
+
+	return ChunkSummary(*leading, totals, total, has_items, True)
+
+
+def stitch_chunks(summaries: Iterable[ChunkSummary]) -> List[int]:
+	"""
+	Combine the summaries of consecutive byte ranges into the totals for every elf, in order.
+
+	:param summaries:
+	"""
+
+	totals = []
+	carry = 0
+	carry_has_items = False
+
+	for summary in summaries:
+		carry += summary.leading
+		carry_has_items |= summary.leading_has_items
+
+		if summary.has_separator:
+			if carry_has_items:
+				totals.append(carry)
+			totals.extend(summary.totals)
+			carry = summary.trailing
+			carry_has_items = summary.trailing_has_items
+
+	if carry_has_items:
+		totals.append(carry)
+
+	return totals
+
+
+def parallel_calories(
+		filename: PathLike,
+		processes: Optional[int] = None,
+		chunk_size: int = 16 * 1024 * 1024,
+		) -> List[int]:
+	"""
+	Returns the total calories carried by each elf in ``filename``, in the order the elves appear,
+	aggregating byte ranges of the file in a process pool.
+
+	:param filename:
+	:param processes: The number of worker processes. Defaults to the number of CPUs.
+	:param chunk_size: The approximate size of each byte range, in bytes.
+	"""
+
+	boundaries = chunk_boundaries(filename, chunk_size)
+	starts, ends = zip(*boundaries)
+
+	with ProcessPoolExecutor(max_workers=processes) as executor:
+		summaries = executor.map(summarise_chunk, [filename] * len(boundaries), starts, ends)
+		return stitch_chunks(summaries)
+
+
+class InventoryFollower:
+	"""
+	Maintains the top ``n`` elf totals for an inventory file which is being appended to.
+
+	Each call to :meth:`~.update` reads only the bytes appended since the previous call,
+	so the cost of refreshing the leaderboard depends on the size of the new data rather than the size of the file.
+
+	:param filename:
+	:param n: The number of totals to keep.
+	:param block_size: The number of bytes to read from the file at a time.
+	"""
+
+	def __init__(self, filename: PathLike, n: int = 3, block_size: int = 1024 * 1024):
+		self.filename = filename
+		self.n = n
+		self.block_size = block_size
+		self.reset()
+
+	def reset(self) -> None:
+		"""
+		Forget everything read so far, so the next :meth:`~.update` starts again from the beginning of the file.
+		"""
+
+		#: The offset of the first byte which has not yet been processed.
+		self.offset = 0
+
+		#: The sum of the items read so far for the elf whose inventory has not yet ended.
+		self.current_total = 0
+
+		#: Whether any items have been read for the elf whose inventory has not yet ended.
+		self.current_has_items = False
+
+		#: The totals of the elves whose inventories have ended.
+		self.leaderboard = Leaderboard(self.n)
+
+	def update(self) -> bool:
+		"""
+		Process any complete lines appended to the file since the last update.
+
+		If the file has shrunk it is assumed to have been replaced, and is read again from the beginning.
+
+		:returns: Whether any new lines were processed.
+		"""
+
+		if os.path.getsize(self.filename) < self.offset:
+			self.reset()
+
+		total = self.current_total
+		has_items = self.current_has_items
+		processed = False
+
+		with open(self.filename, "rb") as fp:
+			fp.seek(self.offset)
+			partial_line = b''
+
+			# Read in fixed-size blocks, so the first update of a large file does not load it all at once.
+			while True:
+				block = fp.read(self.block_size)
+				if not block:
+					break
+
+				lines = (partial_line + block).split(b'\n')
+				# The last line may be incomplete, so carry it over to the next block.
+				partial_line = lines.pop()
+
+				for line in lines:
+					line = line.strip()
+					if line:
+						total += int(line)
+						has_items = True
+					elif has_items:
+						self.leaderboard.push(total)
+						total = 0
+						has_items = False
+
+				if lines:
+					processed = True
+					self.offset = fp.tell() - len(partial_line)
+					self.current_total = total
+					self.current_has_items = has_items
+
+		# A line without a trailing newline may still be being written, so it is left for the next update.
+		return processed
+
+	def top(self, n: Optional[int] = None) -> List[int]:
+		"""
+		Returns the largest totals, in descending order.
+
+		The elf whose inventory has not yet ended is included with the items read so far.
+
+		:param n: The number of totals to return. Defaults to the size of the leaderboard.
+		"""
+
+		if n is None:
+			n = self.n
+
+		top = self.leaderboard.top(n)
+
+		if self.current_has_items:
+			top = sorted([*top, self.current_total], reverse=True)[:n]
+
+		return top
+
+	@property
+	def max(self) -> int:
+		"""
+		The largest total seen so far.
+		"""
+
+		top = self.top(1)
+
+		if not top:
+			raise ValueError("No totals have been read from the inventory")
+
+		return top[0]
+
+
+def follow_calories(filename: PathLike, n: int = 3, interval: float = 1.0) -> Iterator[List[int]]:
+	"""
+	Watch ``filename`` for appended lines, yielding the top ``n`` totals each time they change.
+
+	The current top totals are yielded straight away. The generator never finishes on its own.
+
+	:param filename:
+	:param n: The number of totals to keep.
+	:param interval: The time to wait between checking the file for new lines, in seconds.
+	"""
+
+	follower = InventoryFollower(filename, n)
+	follower.update()
+	top = follower.top()
+	yield top
+
+	while True:
+		time.sleep(interval)
+		if follower.update() and follower.top() != top:
+			top = follower.top()
+			yield top
+
+
+class CalorieIndex:
+	"""
+	A sorted index over the elves' calorie totals, with prefix sums, for answering rank and percentile queries.
+
+	Building the index costs ``O(n log n)``; each query afterwards costs ``O(log n)`` or better.
+
+	:param totals: The total calories carried by each elf, such as ``per_elf_calorie_totals``.
+	"""
+
+	def __init__(self, totals: Iterable[int]):
+		#: The total calories carried by each elf, in the order the elves appear.
+		self.totals = list(map(int, totals))
+
+		self._sorted = sorted(self.totals)
+		self._prefix_sums = [0, *accumulate(self._sorted)]
+
+	def __len__(self) -> int:
+		return len(self.totals)
+
+	def count_above(self, calories: int) -> int:
+		"""
+		Returns the number of elves carrying more than ``calories`` calories.
+
+		:param calories:
+		"""
+
+		return len(self._sorted) - bisect.bisect_right(self._sorted, calories)
+
+	def count_at_most(self, calories: int) -> int:
+		"""
+		Returns the number of elves carrying ``calories`` calories or fewer.
+
+		:param calories:
+		"""
+
+		return bisect.bisect_right(self._sorted, calories)
+
+	def rank(self, elf: int) -> int:
+		"""
+		Returns the rank of the given elf, where the elf carrying the most calories has rank 1.
+
+		Elves carrying the same number of calories share a rank.
+
+		:param elf: The index of the elf, counting from zero in the order the elves appear.
+		"""
+
+		return self.count_above(self.totals[elf]) + 1
+
+	def percentile(self, calories: int) -> float:
+		"""
+		Returns the percentage of elves carrying ``calories`` calories or fewer.
+
+		:param calories:
+		"""
+
+		if not self._sorted:
+			raise ValueError("The index is empty")
+
+		return 100 * self.count_at_most(calories) / len(self._sorted)
+
+	def elf_percentile(self, elf: int) -> float:
+		"""
+		Returns the percentage of elves carrying no more calories than the given elf.
+
+		:param elf: The index of the elf, counting from zero in the order the elves appear.
+		"""
+
+		return self.percentile(self.totals[elf])
+
+	def sum_top(self, k: int) -> int:
+		"""
+		Returns the total calories carried by the ``k`` elves carrying the most calories.
+
+		:param k:
+		"""
+
+		if k < 0:
+			raise ValueError("'k' cannot be negative")
+
+		k = min(k, len(self._sorted))
+		return self._prefix_sums[-1] - self._prefix_sums[len(self._sorted) - k]
+
+	def sum_above(self, calories: int) -> int:
+		"""
+		Returns the total calories carried by the elves carrying more than ``calories`` calories.
+
+		:param calories:
+		"""
+
+		return self.sum_top(self.count_above(calories))
+
+
+def elf_offsets(elf_ids: numpy.ndarray) -> numpy.ndarray:
+	"""
+	Convert the elf each item belongs to into the offsets of each elf's first item.
+
+	The returned array has one more element than there are elves; the last element is the total number of items,
+	so elf ``i``'s items are ``items[offsets[i]:offsets[i + 1]]``.
+
+	:param elf_ids: The (non-decreasing) elf each item belongs to, as returned by :func:`~.parse_inventory`.
+	"""
+
+	elf_starts = numpy.flatnonzero(numpy.diff(elf_ids, prepend=-1))
+	return numpy.append(elf_starts, elf_ids.size).astype(numpy.int64)
+
+
+def columnar_totals(items: numpy.ndarray, offsets: numpy.ndarray) -> numpy.ndarray:
+	"""
+	Sum the items belonging to each elf, given the offsets of each elf's first item.
+
+	:param items: The calories of each item.
+	:param offsets: The offsets of each elf's first item, followed by the total number of items.
+	"""
+
+	if not items.size:
+		return numpy.zeros(0, dtype=numpy.int64)
+
+	return numpy.add.reduceat(items, offsets[:-1])
+
+
+def save_columnar(filename: PathLike, items: numpy.ndarray, offsets: numpy.ndarray) -> None:
+	"""
+	Write a parsed inventory to ``filename`` in the columnar format.
+
+	The file consists of a 24 byte header, the calories of every item as little-endian ``int64``,
+	and then the offsets of each elf's first item (followed by the number of items) as little-endian ``int64``.
+
+	:param filename:
+	:param items: The calories of each item.
+	:param offsets: The offsets of each elf's first item, followed by the total number of items.
+	"""
+
+	with open(filename, "wb") as fp:
+		fp.write(_COLUMNAR_HEADER.pack(_COLUMNAR_MAGIC, items.size, offsets.size - 1))
+		fp.write(numpy.ascontiguousarray(items, dtype=_COLUMNAR_DTYPE).tobytes())
+		fp.write(numpy.ascontiguousarray(offsets, dtype=_COLUMNAR_DTYPE).tobytes())
+
+
+def load_columnar(filename: PathLike) -> Tuple[numpy.ndarray, numpy.ndarray]:
+	"""
+	Memory map a columnar inventory file written by :func:`~.save_columnar`.
+
+	The returned arrays are read-only views of the file; no data is copied until it is used.
+
+	:param filename:
+
+	:returns: A tuple of ``(items, offsets)``.
+	"""
+
+	with open(filename, "rb") as fp:
+		magic, n_items, n_elves = _COLUMNAR_HEADER.unpack(fp.read(_COLUMNAR_HEADER.size))
+
+	if magic != _COLUMNAR_MAGIC:
+		raise ValueError(f"{os.fspath(filename)!r} is not a columnar inventory file")
+
+	expected_size = _COLUMNAR_HEADER.size + (n_items + n_elves + 1) * _COLUMNAR_DTYPE.itemsize
+	if os.path.getsize(filename) != expected_size:
+		raise ValueError(f"{os.fspath(filename)!r} is truncated or corrupt")
+
+	if n_items:
+		items = numpy.memmap(
+				filename,
+				dtype=_COLUMNAR_DTYPE,
+				mode='r',
+				offset=_COLUMNAR_HEADER.size,
+				shape=(n_items, ),
+				)
+	else:
+		# Zero-length memory maps are not allowed
+		items = numpy.zeros(0, dtype=_COLUMNAR_DTYPE)
+
+	offsets = numpy.memmap(
+			filename,
+			dtype=_COLUMNAR_DTYPE,
+			mode='r',
+			offset=_COLUMNAR_HEADER.size + n_items * _COLUMNAR_DTYPE.itemsize,
+			shape=(n_elves + 1, ),
+			)
+
+	return items, offsets
+
+
+def cached_calories(filename: PathLike, cache_filename: Optional[PathLike] = None) -> numpy.ndarray:
+	"""
+	Returns the total calories carried by each elf in ``filename``,
+	using a columnar copy of the inventory to avoid parsing the text again on later runs.
+
+	The columnar copy is (re)written whenever it is missing or older than the inventory.
+
+	:param filename:
+	:param cache_filename: The columnar copy of the inventory. Defaults to ``filename`` with ``.elfcal`` appended.
+	"""
+
+	if cache_filename is None:
+		cache_filename = os.fspath(filename) + ".elfcal"
+
+	if not os.path.exists(cache_filename) or os.path.getmtime(cache_filename) < os.path.getmtime(filename):
+		with open(filename, "rb") as fp:
+			items, elf_ids = parse_inventory(fp.read())
+		save_columnar(cache_filename, items, elf_offsets(elf_ids))
+
+	return columnar_totals(*load_columnar(cache_filename))
@@ -0,0 +1,28 @@
+"""
+Compare the speed of the different ways of scoring a strategy guide.
+
+The puzzle input is repeated to make a guide large enough to time meaningfully.
+"""
+
+# stdlib
+import timeit
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from scoring import histogram_score_guide, numpy_score_guide, score_guide
+
+REPEATS = 1000
+NUMBER = 5
+
+guide = PathPlus("input.txt").read_bytes() * REPEATS
+n_rounds = guide.count(b'\n')
+
+expected = score_guide(guide)
+print(f"Scoring {n_rounds} rounds, best of {NUMBER}:")
+
+for engine in [score_guide, histogram_score_guide, numpy_score_guide]:
+	assert engine(guide) == expected, engine.__name__
+	best = min(timeit.repeat(lambda: engine(guide), number=1, repeat=NUMBER))
+	print(f"  {engine.__name__:<22} {best * 1000:>9.2f} ms  {n_rounds / best:>14,.0f} rounds/s")
@@ -33,63 +33,14 @@ What would your total score be if everything goes exactly according to your stra
 # 3rd party
 from domdf_python_tools.paths import PathPlus
 
-# Read input file and split into games
-games = PathPlus("input.txt").read_text().strip().split('\n')
-
-total_score = 0
-
-ROCK_SCORE = 1
-PAPER_SCORE = 2
-SCISSORS_SCORE = 3
-
-LOSE_SCORE = 0
-DRAW_SCORE = 3
-WIN_SCORE = 6
-
-for game in games:
-	they_play, we_play = game.split(' ')
-
-	if they_play == 'A':  # Rock
-		if we_play == 'X':  # Rock
-			# Draw
-			total_score += ROCK_SCORE
-			total_score += DRAW_SCORE
-		elif we_play == 'Y':  # Paper
-			# Win
-			total_score += PAPER_SCORE
-			total_score += WIN_SCORE
-		elif we_play == 'Z':  # Scissors
-			# Lose
-			total_score += SCISSORS_SCORE
-			total_score += LOSE_SCORE
-
-	elif they_play == 'B':  # Paper
-		if we_play == 'X':  # Rock
-			# Lose
-			total_score += ROCK_SCORE
-			total_score += LOSE_SCORE
-		elif we_play == 'Y':  # Paper
-			# Draw
-			total_score += PAPER_SCORE
-			total_score += DRAW_SCORE
-		elif we_play == 'Z':  # Scissors
-			# Win
-			total_score += SCISSORS_SCORE
-			total_score += WIN_SCORE
-
-	elif they_play == 'C':  # Scissors
-		if we_play == 'X':  # Rock
-			# Win
-			total_score += ROCK_SCORE
-			total_score += WIN_SCORE
-		elif we_play == 'Y':  # Paper
-			# Lose
-			total_score += PAPER_SCORE
-			total_score += LOSE_SCORE
-		elif we_play == 'Z':  # Scissors
-			# Draw
-			total_score += SCISSORS_SCORE
-			total_score += DRAW_SCORE
+# this package
+from scoring import score_guide
+
+# Read input file
+guide = PathPlus("input.txt").read_bytes()
+
+# Score both interpretations of the second column in a single pass
+total_score, total_score_by_outcome = score_guide(guide)
 
 print(f"The total score is {total_score}")  # 10624
 
@@ -108,51 +59,4 @@ Now that you're correctly decrypting the ultra top secret strategy guide, you wo
 Following the Elf's instructions for the second column, what would your total score be if everything goes exactly according to your strategy guide?
 """
 
-total_score = 0
-
-for game in games:
-	they_play, outcome = game.split(' ')
-
-	if they_play == 'A':  # Rock
-		if outcome == 'X':  # Need to lose
-			# Scissors
-			total_score += SCISSORS_SCORE
-			total_score += LOSE_SCORE
-		elif outcome == 'Y':  # Need to draw
-			# Rock
-			total_score += ROCK_SCORE
-			total_score += DRAW_SCORE
-		elif outcome == 'Z':  # Need to win
-			# Paper
-			total_score += PAPER_SCORE
-			total_score += WIN_SCORE
-
-	elif they_play == 'B':  # Paper
-		if outcome == 'X':  # Need to lose
-			# Rock
-			total_score += ROCK_SCORE
-			total_score += LOSE_SCORE
-		elif outcome == 'Y':  # Need to draw
-			# Paper
-			total_score += PAPER_SCORE
-			total_score += DRAW_SCORE
-		elif outcome == 'Z':  # Need to win
-			# Scissors
-			total_score += SCISSORS_SCORE
-			total_score += WIN_SCORE
-
-	elif they_play == 'C':  # Scissors
-		if outcome == 'X':  # Need to lose
-			# Paper
-			total_score += PAPER_SCORE
-			total_score += LOSE_SCORE
-		elif outcome == 'Y':  # Need to draw
-			# Scissors
-			total_score += SCISSORS_SCORE
-			total_score += DRAW_SCORE
-		elif outcome == 'Z':  # Need to win
-			# Rock
-			total_score += ROCK_SCORE
-			total_score += WIN_SCORE
-
-print(f"The total score is {total_score}")  # 14060
+print(f"The total score is {total_score_by_outcome}")  # 14060
@@ -0,0 +1,376 @@
+"""
+Table-driven scoring of rock paper scissors strategy guides.
+
+Each round is scored by looking up the two letters in a precomputed 3x3 table,
+rather than by walking a chain of string comparisons.
+
+As a guide only contains nine different kinds of round,
+:func:`~.histogram_score_guide` instead counts how often each kind appears and scores the counts.
+:func:`~.numpy_score_guide` treats the fixed-width lines as a NumPy array and gathers the scores from the tables.
+:func:`~.score_all_mappings` reuses the counts to score every way of decoding the second letter.
+:func:`~.score_guides` scores a whole batch of strategy guides in a process pool.
+"""
+
+# stdlib
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# 3rd party
+import numpy
+from domdf_python_tools.typing import PathLike
+
+__all__ = [
+		"BatchResult",
+		"DRAW_SCORE",
+		"GuideScore",
+		"LOSE_SCORE",
+		"OUTCOME_SCORES",
+		"PAPER_SCORE",
+		"ROCK_SCORE",
+		"SCISSORS_SCORE",
+		"SHAPE_SCORES",
+		"WIN_SCORE",
+		"best_mapping",
+		"count_rounds",
+		"mapping_scores",
+		"histogram_score_guide",
+		"numpy_score_guide",
+		"score_all_mappings",
+		"score_counts",
+		"score_guide",
+		"score_guide_file",
+		"score_guides",
+		]
+
+ROCK_SCORE = 1
+PAPER_SCORE = 2
+SCISSORS_SCORE = 3
+
+LOSE_SCORE = 0
+DRAW_SCORE = 3
+WIN_SCORE = 6
+
+# In both tables the rows are indexed by what they play (A, B, C = Rock, Paper, Scissors)
+# and the columns by the second letter of the round (X, Y, Z).
+
+#: The score for each round when the second letter is the shape we play (X, Y, Z = Rock, Paper, Scissors).
+SHAPE_SCORES = (
+		(ROCK_SCORE + DRAW_SCORE, PAPER_SCORE + WIN_SCORE, SCISSORS_SCORE + LOSE_SCORE),  # Rock
+		(ROCK_SCORE + LOSE_SCORE, PAPER_SCORE + DRAW_SCORE, SCISSORS_SCORE + WIN_SCORE),  # Paper
+		(ROCK_SCORE + WIN_SCORE, PAPER_SCORE + LOSE_SCORE, SCISSORS_SCORE + DRAW_SCORE),  # Scissors
+		)
+
+#: The score for each round when the second letter is how the round needs to end (X, Y, Z = Lose, Draw, Win).
+OUTCOME_SCORES = (
+		(SCISSORS_SCORE + LOSE_SCORE, ROCK_SCORE + DRAW_SCORE, PAPER_SCORE + WIN_SCORE),  # Rock
+		(ROCK_SCORE + LOSE_SCORE, PAPER_SCORE + DRAW_SCORE, SCISSORS_SCORE + WIN_SCORE),  # Paper
+		(PAPER_SCORE + LOSE_SCORE, SCISSORS_SCORE + DRAW_SCORE, ROCK_SCORE + WIN_SCORE),  # Scissors
+		)
+
+_A = ord('A')
+_X = ord('X')
+_SPACE = ord(' ')
+
+# The end of one round immediately followed by the start of another.
+_JOINED_ROUNDS_RE = re.compile(b"[XYZ][ABC]")
+_NEWLINE = ord('\n')
+
+
+def score_guide(guide: bytes) -> Tuple[int, int]:
+	"""
+	Score every round of the strategy guide under both interpretations of the second letter, in a single pass.
+
+	:param guide: The raw contents of the strategy guide.
+
+	:returns: A tuple of the total score when the second letter is the shape we play,
+		and the total score when it is how the round needs to end.
+	"""
+
+	shape_total = 0
+	outcome_total = 0
+
+	for line_number, line in enumerate(guide.splitlines(), start=1):
+		if not line:
+			continue
+
+		they_play = line[0] - _A
+		second_letter = line[-1] - _X
+
+		if len(line) != 3 or line[1] != _SPACE or not (0 <= they_play <= 2 and 0 <= second_letter <= 2):
+			raise ValueError(f"Invalid round {line.decode(errors='replace')!r} on line {line_number}")
+
+		shape_total += SHAPE_SCORES[they_play][second_letter]
+		outcome_total += OUTCOME_SCORES[they_play][second_letter]
+
+	return shape_total, outcome_total
+
+
+def count_rounds(guide: bytes) -> Tuple[Tuple[int, int, int], ...]:
+	"""
+	Count how often each of the nine kinds of round (``A X`` to ``C Z``) appears in the strategy guide.
+
+	The counting is done with :meth:`bytes.count`, so no Python code runs per round.
+
+	:param guide: The raw contents of the strategy guide.
+
+	:returns: A 3x3 matrix of counts, indexed in the same way as :py:data:`~.SHAPE_SCORES`.
+	"""
+
+	counts = tuple(
+			tuple(guide.count(bytes([they_play, _SPACE, second_letter])) for second_letter in range(_X, _X + 3))
+			for they_play in range(_A, _A + 3)
+			)
+
+	# Everything other than the rounds themselves must be line breaks.
+	n_rounds = sum(map(sum, counts))
+	if n_rounds * 3 + guide.count(b'\n') + guide.count(b'\r') != len(guide):
+		raise ValueError("The strategy guide contains invalid rounds")
+
+	# ... and each round must be on its own line, rather than running straight into the next one.
+	if _JOINED_ROUNDS_RE.search(guide):
+		raise ValueError("The strategy guide contains more than one round on a line")
+
+	return counts
+
+
+def score_counts(counts: Sequence[Sequence[int]], scores: Sequence[Sequence[int]]) -> int:
+	"""
+	Returns the total score for the rounds in ``counts``, as the dot product of the counts and the score table.
+
+	:param counts: A 3x3 matrix of counts, as returned by :func:`~.count_rounds`.
+	:param scores: A 3x3 score table, such as :py:data:`~.SHAPE_SCORES` or :py:data:`~.OUTCOME_SCORES`.
+	"""
+
+	return sum(
+			count * score
+			for count_row, score_row in zip(counts, scores)
+			for count, score in zip(count_row, score_row)
+			)
+
+
+def histogram_score_guide(guide: bytes) -> Tuple[int, int]:
+	"""
+	Score the strategy guide under both interpretations of the second letter from a count of each kind of round.
+
+	The cost per round is that of nine :meth:`bytes.count` scans, rather than an iteration of a Python loop.
+
+	:param guide: The raw contents of the strategy guide.
+
+	:returns: A tuple of the total score when the second letter is the shape we play,
+		and the total score when it is how the round needs to end.
+	"""
+
+	counts = count_rounds(guide)
+	return score_counts(counts, SHAPE_SCORES), score_counts(counts, OUTCOME_SCORES)
+
+
+_SHAPE_SCORES_ARRAY = numpy.array(SHAPE_SCORES, dtype=numpy.int64)
+_OUTCOME_SCORES_ARRAY = numpy.array(OUTCOME_SCORES, dtype=numpy.int64)
+
+
+def numpy_score_guide(guide: bytes) -> Tuple[int, int]:
+	"""
+	Score the strategy guide under both interpretations of the second letter using NumPy array operations.
+
+	Each round is four bytes (a letter, a space, a letter and a newline), so the guide is viewed as an
+	``(n, 4)`` array and the letter columns are used to gather the scores from the tables.
+	Guides which are not in exactly that layout (e.g. with blank lines or ``CRLF`` line endings)
+	are scored by :func:`~.score_guide` instead.
+
+	:param guide: The raw contents of the strategy guide.
+
+	:returns: A tuple of the total score when the second letter is the shape we play,
+		and the total score when it is how the round needs to end.
+	"""
+
+	if len(guide) % 4 == 3 and not guide.endswith(b'\n'):
+		guide += b'\n'
+
+	if len(guide) % 4:
+		return score_guide(guide)
+
+	rounds = numpy.frombuffer(guide, dtype=numpy.uint8).reshape(-1, 4)
+	they_play = rounds[:, 0].astype(numpy.intp) - _A
+	second_letter = rounds[:, 2].astype(numpy.intp) - _X
+
+	is_regular = (
+			(rounds[:, 1] == _SPACE) & (rounds[:, 3] == _NEWLINE)
+			& (they_play >= 0) & (they_play <= 2) & (second_letter >= 0) & (second_letter <= 2)
+			)
+
+	if not is_regular.all():
+		return score_guide(guide)
+
+	return (
+			int(_SHAPE_SCORES_ARRAY[they_play, second_letter].sum()),
+			int(_OUTCOME_SCORES_ARRAY[they_play, second_letter].sum()),
+			)
+
+
+_SHAPE_NAMES = ("Rock", "Paper", "Scissors")
+
+
+def mapping_scores(mapping: Sequence[int]) -> Tuple[Tuple[int, int, int], ...]:
+	"""
+	Build the score table for a decoding where the second letter is the shape we play.
+
+	:param mapping: The shape (0, 1, 2 = Rock, Paper, Scissors) that each of X, Y and Z stands for.
+	"""
+
+	return tuple(tuple(row[shape] for shape in mapping) for row in SHAPE_SCORES)
+
+
+def score_all_mappings(guide: bytes) -> Dict[str, int]:
+	"""
+	Score the strategy guide under every way of decoding the second letter, from a single scan of the guide.
+
+	This covers the six ways of assigning X, Y and Z to Rock, Paper and Scissors,
+	plus the interpretation where the second letter is how the round needs to end.
+
+	:param guide: The raw contents of the strategy guide.
+
+	:returns: A mapping of a description of each decoding (e.g. ``'X=Rock Y=Paper Z=Scissors'`` or ``'outcome'``)
+		to the total score under that decoding.
+	"""
+
+	counts = count_rounds(guide)
+	scores = {}
+
+	for mapping in permutations(range(3)):
+		description = ' '.join(f"{letter}={_SHAPE_NAMES[shape]}" for letter, shape in zip("XYZ", mapping))
+		scores[description] = score_counts(counts, mapping_scores(mapping))
+
+	scores["outcome"] = score_counts(counts, OUTCOME_SCORES)
+
+	return scores
+
+
+def best_mapping(guide: bytes) -> Tuple[str, int]:
+	"""
+	Returns the decoding of the second letter which gives the highest total score, and that score.
+
+	:param guide: The raw contents of the strategy guide.
+	"""
+
+	return max(score_all_mappings(guide).items(), key=lambda item: item[1])
+
+
+class GuideScore(NamedTuple):
+	"""
+	The total scores for a single strategy guide file.
+	"""
+
+	#: The strategy guide file.
+	filename: str
+
+	#: The number of rounds in the guide.
+	rounds: int
+
+	#: The total score when the second letter is the shape we play.
+	shape_score: int
+
+	#: The total score when the second letter is how the round needs to end.
+	outcome_score: int
+
+
+class BatchResult(NamedTuple):
+	"""
+	The scores for a batch of strategy guide files, and how long they took to score.
+	"""
+
+	#: The scores for each file, in the order the files were given.
+	scores: List[GuideScore]
+
+	#: The time taken to score the batch, in seconds.
+	elapsed: float
+
+	@property
+	def rounds(self) -> int:
+		"""
+		The total number of rounds across every file in the batch.
+		"""
+
+		return sum(score.rounds for score in self.scores)
+
+	@property
+	def files_per_second(self) -> float:
+		"""
+		The number of files scored per second.
+		"""
+
+		return len(self.scores) / self.elapsed if self.elapsed else float("inf")
+
+	@property
+	def rounds_per_second(self) -> float:
+		"""
+		The number of rounds scored per second.
+		"""
+
+		return self.rounds / self.elapsed if self.elapsed else float("inf")
+
+	def format_table(self) -> str:
+		"""
+		Format the per-file scores and the throughput as a plain text table.
+		"""
+
+		width = max([len("File"), *(len(score.filename) for score in self.scores)])
+		lines = [f"{'File':<{width}}  {'Rounds':>10}  {'Part 1':>10}  {'Part 2':>10}"]
+
+		for score in self.scores:
+			lines.append(
+					f"{score.filename:<{width}}  {score.rounds:>10}  "
+					f"{score.shape_score:>10}  {score.outcome_score:>10}"
+					)
+
+		lines.append('')
+		lines.append(
+				f"Scored {len(self.scores)} files ({self.rounds} rounds) in {self.elapsed:.3f}s: "
+				f"{self.files_per_second:,.1f} files/s, {self.rounds_per_second:,.0f} rounds/s"
+				)
+
+		return '\n'.join(lines)
+
+
+def score_guide_file(filename: PathLike) -> GuideScore:
+	"""
+	Score a single strategy guide file under both interpretations of the second letter.
+
+	:param filename:
+	"""
+
+	with open(filename, "rb") as fp:
+		counts = count_rounds(fp.read())
+
+	return GuideScore(
+			os.fspath(filename),
+			sum(map(sum, counts)),
+			score_counts(counts, SHAPE_SCORES),
+			score_counts(counts, OUTCOME_SCORES),
+			)
+
+
+def score_guides(path: PathLike, processes: Optional[int] = None, chunksize: int = 16) -> BatchResult:
+	"""
+	Score every strategy guide matching ``path`` in a process pool.
+
+	:param path: Either a directory, in which case every ``.txt`` file in it is scored, or a glob pattern.
+	:param processes: The number of worker processes. Defaults to the number of CPUs.
+	:param chunksize: The number of files sent to a worker process at a time.
+	"""
+
+	if os.path.isdir(path):
+		filenames = sorted(glob.glob(os.path.join(glob.escape(os.fspath(path)), "*.txt")))
+	else:
+		filenames = sorted(glob.glob(os.fspath(path)))
+
+	start_time = time.perf_counter()
+
+	with ProcessPoolExecutor(max_workers=processes) as executor:
+		scores = list(executor.map(score_guide_file, filenames, chunksize=chunksize))
+
+	return BatchResult(scores, time.perf_counter() - start_time)
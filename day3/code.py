@@ -36,32 +36,19 @@ Find the item type that appears in both compartments of each rucksack. What is t
 
 """
 
-# stdlib
-import string
-
 # 3rd party
-from domdf_python_tools.iterative import chunks
 from domdf_python_tools.paths import PathPlus
 
-# Read input file and split into rucksacks
-rucksacks = PathPlus("input.txt").read_text().strip().split('\n')
-
-priorities = 0
+# this package
+from rucksacks import score_rucksacks
 
-for bag in rucksacks:
-	length = len(bag)
-	assert length % 2 == 0
-	compartment_1 = bag[:length // 2]
-	compartment_2 = bag[length // 2:]
-	assert len(compartment_1) == len(compartment_2) == length / 2
-
-	duplicates = {item for item in compartment_1 if item in compartment_2}
-	assert len(duplicates) == 1
+# Read input file and split into rucksacks
+rucksacks = PathPlus("input.txt").read_bytes().strip().splitlines()
 
-	for item in duplicates:
-		priorities += string.ascii_letters.index(item) + 1
+# Find the duplicated items and the badges in a single pass
+duplicate_priorities, badge_priorities = score_rucksacks(rucksacks)
 
-print(f"The sum of the priorities of the duplicated items is {priorities}")  # 8202
+print(f"The sum of the priorities of the duplicated items is {duplicate_priorities}")  # 8202
 
 # === Part 2 ===
 """
@@ -92,16 +79,4 @@ Priorities for these items must still be found to organize the sticker attachmen
 Find the item type that corresponds to the badges of each three-Elf group. What is the sum of the priorities of those item types?
 """
 
-priorities = 0
-
-# for bag in rucksacks:
-
-for elf_group in chunks(rucksacks, 3):
-	unique_items = [set(bag) for bag in elf_group]
-	intersection = unique_items[0] & unique_items[1] & unique_items[2]
-	assert len(intersection) == 1
-
-	for item in intersection:
-		priorities += string.ascii_letters.index(item) + 1
-
-print(f"The sum of the priorities of the badges is {priorities}")  # 2864
+print(f"The sum of the priorities of the badges is {badge_priorities}")  # 2864
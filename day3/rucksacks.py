@@ -0,0 +1,349 @@
+"""
+Bitmask-based analysis of the elves' rucksacks.
+
+Each compartment or bag is represented as a 52-bit integer with one bit per item type,
+where bit ``n`` is set if the item with priority ``n + 1`` is present.
+Items common to several compartments or bags are then found with ``&``,
+and an item's priority is the position of its bit.
+
+The bags are handled as :class:`bytes`, so each item costs a single index into a 256-entry lookup table.
+:func:`~.numpy_score_rucksacks` does the same with NumPy array operations over the whole file at once,
+while :func:`~.iter_bags` and :func:`~.iter_badges` read the file lazily so memory use stays constant.
+:func:`~.parallel_score_rucksacks` divides the file between a pool of processes.
+"""
+
+# stdlib
+import os
+import string
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from operator import or_
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# 3rd party
+import numpy
+from domdf_python_tools.typing import PathLike
+
+__all__ = [
+		"PRIORITIES",
+		"bag_mask",
+		"group_aligned_chunks",
+		"iter_badges",
+		"iter_bags",
+		"mask_priority",
+		"numpy_score_rucksacks",
+		"parallel_score_rucksacks",
+		"score_chunk",
+		"score_rucksacks",
+		"stream_badges",
+		]
+
+#: The priority of each item type, indexed by the item's byte value. Bytes which are not items have priority 0.
+PRIORITIES = tuple(
+		string.ascii_letters.index(chr(byte)) + 1 if chr(byte) in string.ascii_letters else 0 for byte in range(256)
+		)
+
+# The bit for each item type, indexed by the item's byte value.
+_ITEM_BITS = tuple(1 << (priority - 1) if priority else 0 for priority in PRIORITIES)
+_ITEM_BITS_ARRAY = numpy.array(_ITEM_BITS, dtype=numpy.uint64)
+
+# Whether each byte value is whitespace, as removed by bytes.strip().
+_IS_WHITESPACE = numpy.array([bytes([byte]).isspace() for byte in range(256)])
+
+# The number of bytes read at a time when looking for the ends of the groups.
+_SCAN_BLOCK_SIZE = 1 << 24
+
+
+def bag_mask(items: bytes) -> int:
+	"""
+	Returns the bitmask of the item types in a compartment or bag.
+
+	:param items:
+	"""
+
+	return reduce(or_, map(_ITEM_BITS.__getitem__, items), 0)
+
+
+def mask_priority(mask: int) -> int:
+	"""
+	Returns the priority of the single item type in ``mask``.
+
+	:param mask:
+
+	:raises ValueError: If ``mask`` does not contain exactly one item type.
+	"""
+
+	if not mask or mask & (mask - 1):
+		raise ValueError(f"Expected exactly one common item, got {bin(mask).count('1')}")
+
+	return mask.bit_length()
+
+
+def score_rucksacks(rucksacks: Iterable[bytes], group_size: int = 3) -> Tuple[int, int]:
+	"""
+	Find the sum of the priorities of the item in both compartments of each bag,
+	and of the badge common to each group of bags, in a single pass.
+
+	:param rucksacks: The contents of each bag.
+	:param group_size: The number of elves in each group.
+
+	:returns: A tuple of the sum of the duplicated items' priorities and the sum of the badges' priorities.
+	"""
+
+	duplicate_priorities = 0
+	badge_priorities = 0
+	group_mask = 0
+	bags_in_group = 0
+
+	for bag in rucksacks:
+		half = len(bag) // 2
+		if len(bag) % 2:
+			raise ValueError(f"Bag {bag!r} cannot be divided into two equal compartments")
+
+		compartment_1 = bag_mask(bag[:half])
+		compartment_2 = bag_mask(bag[half:])
+		duplicate_priorities += mask_priority(compartment_1 & compartment_2)
+
+		if bags_in_group:
+			group_mask &= compartment_1 | compartment_2
+		else:
+			group_mask = compartment_1 | compartment_2
+
+		bags_in_group += 1
+		if bags_in_group == group_size:
+			badge_priorities += mask_priority(group_mask)
+			bags_in_group = 0
+
+	if bags_in_group:
+		raise ValueError(f"The last group only has {bags_in_group} bags")
+
+	return duplicate_priorities, badge_priorities
+
+
+def iter_bags(filename: PathLike) -> Iterator[bytes]:
+	"""
+	Lazily read the contents of each bag from ``filename``, one line at a time.
+
+	:param filename:
+	"""
+
+	with open(filename, "rb") as fp:
+		for line in fp:
+			line = line.rstrip()
+			if line:
+				yield line
+
+
+def iter_badges(bags: Iterable[bytes], group_size: int = 3) -> Iterator[int]:
+	"""
+	Yields the priority of the badge common to each group of ``group_size`` bags.
+
+	Only the running mask of the current group is kept, so ``bags`` may be arbitrarily long.
+
+	:param bags: The contents of each bag.
+	:param group_size: The number of elves in each group.
+
+	:raises ValueError: If the last group is incomplete.
+	"""
+
+	if group_size < 1:
+		raise ValueError("'group_size' must be at least 1")
+
+	group_mask = 0
+	bags_in_group = 0
+
+	for bag in bags:
+		if bags_in_group:
+			group_mask &= bag_mask(bag)
+		else:
+			group_mask = bag_mask(bag)
+
+		bags_in_group += 1
+		if bags_in_group == group_size:
+			yield mask_priority(group_mask)
+			bags_in_group = 0
+
+	if bags_in_group:
+		raise ValueError(f"The last group only has {bags_in_group} bags")
+
+
+def stream_badges(filename: PathLike, group_size: int = 3) -> int:
+	"""
+	Returns the sum of the priorities of the badges of each group of ``group_size`` bags in ``filename``.
+
+	The file is read lazily, so memory use does not depend on the number of bags.
+
+	:param filename:
+	:param group_size: The number of elves in each group.
+	"""
+
+	return sum(iter_badges(iter_bags(filename), group_size))
+
+
+def _mask_priorities(masks: numpy.ndarray) -> numpy.ndarray:
+	"""
+	Returns the priority of the single item type in each of ``masks``.
+
+	:param masks:
+	"""
+
+	if not numpy.all((masks != 0) & ((masks & (masks - numpy.uint64(1))) == 0)):
+		raise ValueError("Expected exactly one common item in every compartment pair and group")
+
+	# Every mask is a power of two no larger than 2 ** 51, so this is exact.
+	return numpy.log2(masks).astype(numpy.int64) + 1
+
+
+def numpy_score_rucksacks(buffer: bytes, group_size: int = 3) -> Tuple[int, int]:
+	"""
+	Find the sum of the priorities of the item in both compartments of each bag,
+	and of the badge common to each group of bags, using NumPy array operations.
+
+	Every byte is mapped to its item bit, and each half-bag is OR-reduced in segments using the newline offsets.
+	The halves are then ANDed to find the duplicated items, and the groups of bags are ANDed to find the badges.
+
+	:param buffer: The raw contents of the rucksack list, with one bag per line.
+	:param group_size: The number of elves in each group.
+
+	:returns: A tuple of the sum of the duplicated items' priorities and the sum of the badges' priorities.
+	"""
+
+	buffer = buffer.replace(b'\r', b'').strip()
+	if not buffer:
+		return 0, 0
+
+	data = numpy.frombuffer(buffer, dtype=numpy.uint8)
+	line_ends = numpy.append(numpy.flatnonzero(data == ord('\n')), data.size)
+	line_starts = numpy.concatenate(([0], line_ends[:-1] + 1))
+	line_lengths = line_ends - line_starts
+
+	if numpy.any(line_lengths == 0):
+		raise ValueError("Blank lines are not allowed between bags")
+	if numpy.any(line_lengths % 2):
+		raise ValueError("Every bag must divide into two equal compartments")
+	if line_lengths.size % group_size:
+		raise ValueError(f"The last group only has {line_lengths.size % group_size} bags")
+
+	# Each segment runs from the start of a half to the start of the next; newlines have no bit so are harmless.
+	boundaries = numpy.empty(line_starts.size * 2, dtype=numpy.intp)
+	boundaries[0::2] = line_starts
+	boundaries[1::2] = line_starts + line_lengths // 2
+	half_masks = numpy.bitwise_or.reduceat(_ITEM_BITS_ARRAY[data], boundaries)
+
+	compartment_1 = half_masks[0::2]
+	compartment_2 = half_masks[1::2]
+	duplicates = compartment_1 & compartment_2
+	badges = numpy.bitwise_and.reduce((compartment_1 | compartment_2).reshape(-1, group_size), axis=1)
+
+	return int(_mask_priorities(duplicates).sum()), int(_mask_priorities(badges).sum())
+
+
+def group_aligned_chunks(
+		filename: PathLike,
+		group_size: int = 3,
+		bags_per_chunk: int = 300_000,
+		) -> List[Tuple[int, int]]:
+	"""
+	Divide ``filename`` into byte ranges which each contain a whole number of groups of bags.
+
+	Blank lines are not counted as bags, in the same way as they are skipped by :func:`~.score_chunk`.
+
+	:param filename:
+	:param group_size: The number of elves in each group.
+	:param bags_per_chunk: The number of bags in each range. This is rounded up to a multiple of ``group_size``.
+
+	:returns: A list of ``(start, end)`` offsets.
+	"""
+
+	if group_size < 1 or bags_per_chunk < 1:
+		raise ValueError("'group_size' and 'bags_per_chunk' must be at least 1")
+
+	bags_per_chunk = -(-bags_per_chunk // group_size) * group_size
+	file_size = os.path.getsize(filename)
+	starts = [0]
+	offset = 0
+	bags_seen = 0
+	line_has_content = False
+
+	with open(filename, "rb") as fp:
+		while True:
+			block = fp.read(_SCAN_BLOCK_SIZE)
+			if not block:
+				break
+
+			data = numpy.frombuffer(block, dtype=numpy.uint8)
+			newlines = numpy.flatnonzero(data == ord('\n'))
+
+			# Only newlines which end a non-blank line end a bag, matching the blank lines skipped by score_chunk.
+			content_so_far = numpy.cumsum(~_IS_WHITESPACE[data])
+			content_before_newlines = content_so_far[newlines]
+			ends_bag = numpy.diff(content_before_newlines, prepend=0) > 0
+			if newlines.size and line_has_content:
+				ends_bag[0] = True
+
+			bag_ends = newlines[ends_bag]
+			chunk_ends = bag_ends[bags_per_chunk - bags_seen - 1::bags_per_chunk]
+			starts.extend(int(end) + offset + 1 for end in chunk_ends)
+
+			bags_seen = (bags_seen + bag_ends.size) % bags_per_chunk
+			if newlines.size:
+				line_has_content = bool(content_so_far[-1] > content_so_far[newlines[-1]])
+			else:
+				line_has_content = line_has_content or bool(content_so_far[-1])
+
+			offset += len(block)
+
+	if starts[-1] >= file_size and len(starts) > 1:
+		starts.pop()
+
+	return list(zip(starts, [*starts[1:], file_size]))
+
+
+def score_chunk(filename: PathLike, start: int, end: int, group_size: int = 3) -> Tuple[int, int]:
+	"""
+	Score the bags in the given byte range of ``filename``, which must contain a whole number of groups.
+
+	:param filename:
+	:param start: The offset of the start of the range.
+	:param end: The offset of the end of the range (exclusive).
+	:param group_size: The number of elves in each group.
+
+	:returns: A tuple of the sum of the duplicated items' priorities and the sum of the badges' priorities.
+	"""
+
+	with open(filename, "rb") as fp:
+		fp.seek(start)
+		lines = fp.read(end - start).split(b'\n')
+
+	return score_rucksacks(filter(None, map(bytes.rstrip, lines)), group_size)
+
+
+def parallel_score_rucksacks(
+		filename: PathLike,
+		group_size: int = 3,
+		processes: Optional[int] = None,
+		bags_per_chunk: int = 300_000,
+		) -> Tuple[int, int]:
+	"""
+	Find the sum of the priorities of the duplicated items and of the badges, dividing the work between processes.
+
+	The file is divided into ranges containing whole groups of bags with :func:`~.group_aligned_chunks`,
+	so no group is ever split between two processes, and the partial sums from each range are added together.
+
+	:param filename:
+	:param group_size: The number of elves in each group.
+	:param processes: The number of worker processes. Defaults to the number of CPUs.
+	:param bags_per_chunk: The approximate number of bags given to a worker process at a time.
+
+	:returns: A tuple of the sum of the duplicated items' priorities and the sum of the badges' priorities.
+	"""
+
+	chunks = group_aligned_chunks(filename, group_size, bags_per_chunk)
+	starts, ends = zip(*chunks)
+
+	with ProcessPoolExecutor(max_workers=processes) as executor:
+		partial_sums = list(
+				executor.map(score_chunk, [filename] * len(chunks), starts, ends, [group_size] * len(chunks))
+				)
+
+	return sum(duplicates for duplicates, _ in partial_sums), sum(badges for _, badges in partial_sums)
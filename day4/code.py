@@ -46,25 +46,16 @@ In how many assignment pairs does one range fully contain the other?
 # 3rd party
 from domdf_python_tools.paths import PathPlus
 
+# this package
+from sections import count_overlaps
+
 # Read input file and split into elf pairs
 elf_pairs = PathPlus("input.txt").read_text().strip().split('\n')
 
-n_overlapping_assignments = 0
-
-for pair in elf_pairs:
-	first_elf, second_elf = pair.split(',')
-	first_elf_start, first_elf_end = map(int, first_elf.split('-'))
-	second_elf_start, second_elf_end = map(int, second_elf.split('-'))
-	first_elf_range = set(range(first_elf_start, first_elf_end + 1))
-	second_elf_range = set(range(second_elf_start, second_elf_end + 1))
-
-	intersection = first_elf_range & second_elf_range
-	if intersection == first_elf_range:
-		n_overlapping_assignments += 1
-	elif intersection == second_elf_range:
-		n_overlapping_assignments += 1
+# Check for containment and overlap using only the endpoints of each assignment
+n_fully_overlapping_assignments, n_overlapping_assignments = count_overlaps(elf_pairs)
 
-print(f"{n_overlapping_assignments} pairs fully overlap")  # 599
+print(f"{n_fully_overlapping_assignments} pairs fully overlap")  # 599
 
 # === Part 2 ===
 """
@@ -82,17 +73,4 @@ So, in this example, the number of overlapping assignment pairs is 4.
 In how many assignment pairs do the ranges overlap?
 """
 
-n_overlapping_assignments = 0
-
-for pair in elf_pairs:
-	first_elf, second_elf = pair.split(',')
-	first_elf_start, first_elf_end = map(int, first_elf.split('-'))
-	second_elf_start, second_elf_end = map(int, second_elf.split('-'))
-	first_elf_range = set(range(first_elf_start, first_elf_end + 1))
-	second_elf_range = set(range(second_elf_start, second_elf_end + 1))
-
-	intersection = first_elf_range & second_elf_range
-	if intersection:
-		n_overlapping_assignments += 1
-
 print(f"{n_overlapping_assignments} overlap")  # 928
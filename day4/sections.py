@@ -0,0 +1,494 @@
+"""
+Interval arithmetic on the elves' section assignments.
+
+Each assignment is an inclusive range of section IDs,
+so containment and overlap are found by comparing the endpoints, whatever the width of the ranges.
+
+:func:`~.parse_assignments` parses a whole file of pairs into an ``(n, 4)`` NumPy array in one pass,
+for counting containment and overlap with array expressions in :func:`~.numpy_count_overlaps`.
+
+The sweep-line functions compare every assignment in the file with every other,
+rather than only the two elves in each pair, in ``O(n log n + k)`` time for ``k`` overlapping pairs.
+
+:class:`~.AssignmentIndex` answers repeated queries about which assignments cover a section or overlap a range,
+and :func:`~.coverage_profile` counts how many elves cover each section.
+"""
+
+# stdlib
+import bisect
+import heapq
+import warnings
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# 3rd party
+import numpy
+
+__all__ = [
+		"Assignment",
+		"AssignmentIndex",
+		"Coverage",
+		"CoverageRun",
+		"count_containing_pairs",
+		"count_overlapping_pairs",
+		"count_overlaps",
+		"coverage_profile",
+		"iter_assignments",
+		"iter_overlapping_pairs",
+		"numpy_count_overlaps",
+		"parse_assignments",
+		"parse_pair",
+		]
+
+# Turns the separators in ``a-b,c-d`` into whitespace, so every line is four whitespace-separated integers.
+_SEPARATORS_TO_SPACES = bytes.maketrans(b"-,", b"  ")
+
+# Whether each byte value may appear in an assignment file.
+_ASSIGNMENT_BYTES = numpy.array([chr(byte) in "0123456789-,\n" for byte in range(256)])
+
+
+class Assignment(NamedTuple):
+	"""
+	An inclusive range of section IDs assigned to an elf.
+	"""
+
+	#: The first section ID in the assignment.
+	start: int
+
+	#: The last section ID in the assignment.
+	end: int
+
+	def contains(self, other: "Assignment") -> bool:
+		"""
+		Returns whether every section in ``other`` is also in this assignment.
+
+		:param other:
+		"""
+
+		return self.start <= other.start and other.end <= self.end
+
+	def overlaps(self, other: "Assignment") -> bool:
+		"""
+		Returns whether any section is in both this assignment and ``other``.
+
+		:param other:
+		"""
+
+		return self.start <= other.end and other.start <= self.end
+
+
+def parse_pair(pair: str) -> Tuple[Assignment, Assignment]:
+	"""
+	Parse a line of the form ``a-b,c-d`` into the two elves' assignments.
+
+	:param pair:
+	"""
+
+	first_elf, second_elf = pair.split(',')
+	first_elf_start, first_elf_end = first_elf.split('-')
+	second_elf_start, second_elf_end = second_elf.split('-')
+
+	return (
+			Assignment(int(first_elf_start), int(first_elf_end)),
+			Assignment(int(second_elf_start), int(second_elf_end)),
+			)
+
+
+def count_overlaps(elf_pairs: Iterable[str]) -> Tuple[int, int]:
+	"""
+	Count the pairs where one elf's assignment fully contains the other's,
+	and the pairs whose assignments overlap at all, from a single parse of each pair.
+
+	:param elf_pairs: Lines of the form ``a-b,c-d``.
+
+	:returns: A tuple of the number of pairs where one assignment fully contains the other,
+		and the number of pairs which overlap.
+	"""
+
+	n_fully_overlapping = 0
+	n_overlapping = 0
+
+	for pair in elf_pairs:
+		first_elf, second_elf = parse_pair(pair)
+
+		if first_elf.contains(second_elf) or second_elf.contains(first_elf):
+			n_fully_overlapping += 1
+		if first_elf.overlaps(second_elf):
+			n_overlapping += 1
+
+	return n_fully_overlapping, n_overlapping
+
+
+def _check_layout(buffer: bytes) -> None:
+	# Check every line has one comma and two dashes, with one dash on either side of the comma.
+	# Otherwise mistakes on different lines could cancel out, and the values would shift between rows.
+	data = numpy.frombuffer(buffer, dtype=numpy.uint8)
+	if not data.size:
+		return
+
+	if not numpy.all(_ASSIGNMENT_BYTES[data]):
+		raise ValueError("Assignments may only contain digits, '-' and ','")
+
+	line_ends = numpy.append(numpy.flatnonzero(data == ord('\n')), data.size)
+	commas_so_far = numpy.cumsum(data == ord(','))
+	dashes_so_far = numpy.cumsum(data == ord('-'))
+
+	commas_per_line = numpy.diff(commas_so_far[line_ends - 1], prepend=0)
+	dashes_per_line = numpy.diff(dashes_so_far[line_ends - 1], prepend=0)
+	if numpy.any(commas_per_line != 1) or numpy.any(dashes_per_line != 2):
+		raise ValueError("Every line must be of the form 'a-b,c-d'")
+
+	# With exactly one comma per line, the nth comma belongs to the nth line.
+	commas = numpy.flatnonzero(data == ord(','))
+	dashes_before_line = numpy.concatenate(([0], dashes_so_far[line_ends[:-1]]))
+	if numpy.any(dashes_so_far[commas] - dashes_before_line != 1):
+		raise ValueError("Every line must be of the form 'a-b,c-d'")
+
+
+def parse_assignments(buffer: bytes) -> numpy.ndarray:
+	"""
+	Parse every ``a-b,c-d`` line of an assignment file into an ``(n, 4)`` integer array.
+
+	The columns are the first elf's start and end, then the second elf's start and end.
+	Every line is checked for one ``,`` and two ``-`` in the right places before it is parsed,
+	so a malformed line cannot be balanced out by another.
+
+	:param buffer: The raw contents of the assignment file.
+	"""
+
+	buffer = buffer.replace(b'\r', b'').strip()
+	_check_layout(buffer)
+
+	text = buffer.translate(_SEPARATORS_TO_SPACES)
+	n_pairs = text.count(b'\n') + 1 if text else 0
+
+	with warnings.catch_warnings():
+		# Some versions of NumPy only warn, rather than raising an error, if the whole string cannot be parsed.
+		warnings.simplefilter("ignore", DeprecationWarning)
+		values = numpy.fromstring(text, dtype=numpy.int64, sep=' ')
+
+	if values.size != n_pairs * 4:
+		raise ValueError("Every line must be of the form 'a-b,c-d'")
+
+	return values.reshape(n_pairs, 4)
+
+
+def numpy_count_overlaps(assignments: numpy.ndarray) -> Tuple[int, int]:
+	"""
+	Count the pairs where one elf's assignment fully contains the other's,
+	and the pairs whose assignments overlap at all, using boolean array expressions.
+
+	:param assignments: An ``(n, 4)`` array, as returned by :func:`~.parse_assignments`.
+
+	:returns: A tuple of the number of pairs where one assignment fully contains the other,
+		and the number of pairs which overlap.
+	"""
+
+	first_elf_start, first_elf_end, second_elf_start, second_elf_end = assignments.T
+
+	first_contains_second = (first_elf_start <= second_elf_start) & (second_elf_end <= first_elf_end)
+	second_contains_first = (second_elf_start <= first_elf_start) & (first_elf_end <= second_elf_end)
+	overlapping = (first_elf_start <= second_elf_end) & (second_elf_start <= first_elf_end)
+
+	return int((first_contains_second | second_contains_first).sum()), int(overlapping.sum())
+
+
+def iter_assignments(elf_pairs: Iterable[str]) -> Iterator[Assignment]:
+	"""
+	Yields every elf's assignment, in order. The elves in line ``n`` become assignments ``2n`` and ``2n + 1``.
+
+	:param elf_pairs: Lines of the form ``a-b,c-d``.
+	"""
+
+	for pair in elf_pairs:
+		yield from parse_pair(pair)
+
+
+def _start_order(assignments: Sequence[Assignment]) -> List[int]:
+	# Ordering by start, then by descending end, puts every assignment after any others which contain it.
+	return sorted(range(len(assignments)), key=lambda idx: (assignments[idx].start, -assignments[idx].end))
+
+
+def iter_overlapping_pairs(
+		assignments: Sequence[Assignment],
+		containment_only: bool = False,
+		) -> Iterator[Tuple[int, int]]:
+	"""
+	Sweep across the sorted assignments, yielding the indices of every pair of assignments which overlap.
+
+	Each pair is yielded once, with the smaller index first.
+
+	:param assignments:
+	:param containment_only: Only yield the pairs where one assignment fully contains the other.
+	"""
+
+	# The assignments which have started, as (end, index), so those which have ended can be discarded.
+	active: List[Tuple[int, int]] = []
+
+	for idx in _start_order(assignments):
+		assignment = assignments[idx]
+
+		while active and active[0][0] < assignment.start:
+			heapq.heappop(active)
+
+		# Every assignment still active started no later than this one, and has not yet ended.
+		for active_end, active_idx in active:
+			if not containment_only or active_end >= assignment.end:
+				yield (active_idx, idx) if active_idx < idx else (idx, active_idx)
+
+		heapq.heappush(active, (assignment.end, idx))
+
+
+def count_overlapping_pairs(assignments: Sequence[Assignment]) -> int:
+	"""
+	Count the pairs of assignments which overlap, in ``O(n log n)`` time without enumerating them.
+
+	:param assignments:
+	"""
+
+	active: List[int] = []
+	count = 0
+
+	for idx in _start_order(assignments):
+		assignment = assignments[idx]
+
+		while active and active[0] < assignment.start:
+			heapq.heappop(active)
+
+		count += len(active)
+		heapq.heappush(active, assignment.end)
+
+	return count
+
+
+def count_containing_pairs(assignments: Sequence[Assignment]) -> int:
+	"""
+	Count the pairs of assignments where one fully contains the other, in ``O(n log n)`` time.
+
+	Identical assignments are counted as one pair.
+
+	:param assignments:
+	"""
+
+	# In start order, an assignment is contained by each earlier assignment which ends no earlier than it does.
+	# A Fenwick tree over the (descending) ranks of the ends counts those in O(log n).
+	ends = sorted({assignment.end for assignment in assignments})
+	tree = [0] * (len(ends) + 1)
+	count = 0
+
+	for idx in _start_order(assignments):
+		# The assignment with the latest end has rank 1.
+		end_rank = len(ends) - bisect.bisect_left(ends, assignments[idx].end)
+
+		position = end_rank
+		while position:
+			count += tree[position]
+			position -= position & -position
+
+		position = end_rank
+		while position <= len(ends):
+			tree[position] += 1
+			position += position & -position
+
+	return count
+
+
+class _Node:
+	"""
+	A node of a centred interval tree, holding the assignments which contain its centre.
+	"""
+
+	__slots__ = ("centre", "by_start", "by_end", "left", "right")
+
+	def __init__(self, centre: int, assignments: Sequence[Tuple[int, int, int]]):
+		self.centre = centre
+
+		# (start, index) in ascending order of start, and (end, index) in descending order of end.
+		self.by_start = sorted((start, idx) for start, end, idx in assignments)
+		self.by_end = sorted(((end, idx) for start, end, idx in assignments), reverse=True)
+
+		self.left: Optional[_Node] = None
+		self.right: Optional[_Node] = None
+
+
+def _build_tree(assignments: List[Tuple[int, int, int]]) -> Optional[_Node]:
+	if not assignments:
+		return None
+
+	endpoints = sorted(endpoint for start, end, idx in assignments for endpoint in (start, end))
+	centre = endpoints[len(endpoints) // 2]
+
+	left = [assignment for assignment in assignments if assignment[1] < centre]
+	right = [assignment for assignment in assignments if assignment[0] > centre]
+	node = _Node(centre, [assignment for assignment in assignments if assignment[0] <= centre <= assignment[1]])
+	node.left = _build_tree(left)
+	node.right = _build_tree(right)
+
+	return node
+
+
+class AssignmentIndex:
+	"""
+	An index over the elves' assignments for answering stabbing and range queries in ``O(log n + k)`` time.
+
+	Stabbing queries use a centred interval tree, and range queries additionally use the sorted start points.
+
+	:param assignments: The assignments to index, such as from :func:`~.iter_assignments`.
+	"""
+
+	def __init__(self, assignments: Iterable[Assignment]):
+		#: The indexed assignments. Queries return indices into this list.
+		self.assignments = list(assignments)
+
+		self._root = _build_tree([(start, end, idx) for idx, (start, end) in enumerate(self.assignments)])
+		self._by_start = sorted((start, idx) for idx, (start, end) in enumerate(self.assignments))
+
+	def __len__(self) -> int:
+		return len(self.assignments)
+
+	def _stab(self, section: int) -> Iterator[int]:
+		node = self._root
+
+		while node is not None:
+			if section < node.centre:
+				for start, idx in node.by_start:
+					if start > section:
+						break
+					yield idx
+				node = node.left
+			elif section > node.centre:
+				for end, idx in node.by_end:
+					if end < section:
+						break
+					yield idx
+				node = node.right
+			else:
+				for start, idx in node.by_start:
+					yield idx
+				break
+
+	def covering(self, section: int) -> List[int]:
+		"""
+		Returns the indices of the assignments which include the given section.
+
+		:param section:
+		"""
+
+		return sorted(self._stab(section))
+
+	def overlapping(self, start: int, end: int) -> List[int]:
+		"""
+		Returns the indices of the assignments which include any section from ``start`` to ``end`` (inclusive).
+
+		:param start:
+		:param end:
+		"""
+
+		if start > end:
+			raise ValueError("'start' cannot be after 'end'")
+
+		# The assignments covering ``start``, plus those which begin later on in the range.
+		matches = list(self._stab(start))
+		first = bisect.bisect_right(self._by_start, (start, len(self.assignments)))
+		last = bisect.bisect_right(self._by_start, (end, len(self.assignments)))
+		matches.extend(idx for _, idx in self._by_start[first:last])
+
+		return sorted(matches)
+
+
+class CoverageRun(NamedTuple):
+	"""
+	A run of consecutive sections which are all covered by the same number of elves.
+	"""
+
+	#: The first section in the run.
+	start: int
+
+	#: The last section in the run.
+	end: int
+
+	#: The number of elves whose assignments include each section in the run.
+	depth: int
+
+
+class Coverage(NamedTuple):
+	"""
+	How many elves cover each section, as returned by :func:`~.coverage_profile`.
+	"""
+
+	#: The run-length encoded coverage, from the first assigned section to the last.
+	runs: List[CoverageRun]
+
+	#: The greatest number of elves covering any one section.
+	max_depth: int
+
+	#: The runs of sections covered by ``max_depth`` elves.
+	hotspots: List[CoverageRun]
+
+
+def _dense_coverage_runs(starts: numpy.ndarray, ends: numpy.ndarray) -> List[CoverageRun]:
+	# A difference array over every section from the first assigned to the last.
+	first_section = int(starts.min())
+	span = int(ends.max()) - first_section + 1
+	deltas = (
+			numpy.bincount(starts - first_section, minlength=span + 1)
+			- numpy.bincount(ends - first_section + 1, minlength=span + 1)
+			)
+	depths = numpy.cumsum(deltas[:-1])
+
+	run_starts = numpy.flatnonzero(numpy.diff(depths, prepend=-1))
+	run_ends = numpy.append(run_starts[1:] - 1, span - 1)
+	run_depths = depths[run_starts]
+	run_starts += first_section
+	run_ends += first_section
+
+	return [
+			CoverageRun(run_start, run_end, depth)
+			for run_start, run_end, depth in zip(run_starts.tolist(), run_ends.tolist(), run_depths.tolist())
+			]
+
+
+def _sparse_coverage_runs(starts: numpy.ndarray, ends: numpy.ndarray) -> List[CoverageRun]:
+	# The change in coverage at each section where it changes, in order of section.
+	boundaries, inverse = numpy.unique(numpy.concatenate((starts, ends + 1)), return_inverse=True)
+	deltas = numpy.bincount(inverse, weights=numpy.repeat([1, -1], starts.size)).astype(numpy.int64)
+	depths = numpy.cumsum(deltas)[:-1]
+
+	# Merge neighbouring runs with the same depth.
+	is_new_run = numpy.concatenate(([True], depths[1:] != depths[:-1]))
+	run_starts = boundaries[:-1][is_new_run]
+	run_ends = numpy.append(run_starts[1:] - 1, boundaries[-1] - 1)
+	run_depths = depths[is_new_run]
+
+	return [
+			CoverageRun(run_start, run_end, depth)
+			for run_start, run_end, depth in zip(run_starts.tolist(), run_ends.tolist(), run_depths.tolist())
+			]
+
+
+def coverage_profile(assignments: Iterable[Assignment], dense_factor: int = 4) -> Coverage:
+	"""
+	Count how many elves cover each section.
+
+	When the assigned sections are densely packed this uses a difference array over every section.
+	Otherwise only the sorted endpoints, where the coverage changes, are used,
+	so the cost is ``O(n log n)`` in the number of assignments regardless of how wide they are.
+
+	:param assignments: The assignments, such as from :func:`~.iter_assignments`.
+	:param dense_factor: Use a difference array when the number of sections spanned by the assignments
+		is no more than this multiple of the number of assignments.
+	"""
+
+	bounds = numpy.array(list(assignments), dtype=numpy.int64).reshape(-1, 2)
+	starts, ends = bounds[:, 0], bounds[:, 1]
+
+	if not starts.size:
+		runs = []
+	elif int(ends.max()) - int(starts.min()) + 1 <= dense_factor * starts.size:
+		runs = _dense_coverage_runs(starts, ends)
+	else:
+		runs = _sparse_coverage_runs(starts, ends)
+
+	max_depth = max((run.depth for run in runs), default=0)
+	hotspots = [run for run in runs if run.depth == max_depth and max_depth]
+
+	return Coverage(runs, max_depth, hotspots)
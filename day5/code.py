@@ -55,45 +55,24 @@ The Elves just need to know which crate will end up on top of each stack; in thi
 After the rearrangement procedure completes, what crate ends up on top of each stack?
 """
 
-# stdlib
-import pprint
-import re
-from collections import defaultdict, deque
-
 # 3rd party
-from domdf_python_tools.iterative import chunks
 from domdf_python_tools.paths import PathPlus
 
+# this package
+from crates import CRATE_MOVER_9000, CRATE_MOVER_9001, parse_procedure, parse_stacks, rearrange, top_crates
+
 # Read input file
 starting_stacks, rearrangement_procedure = PathPlus("input.txt").read_text().rstrip().split('\n\n')
 # starting_stacks, rearrangement_procedure = PathPlus("example.txt").read_text().rstrip().split('\n\n')
 
-# Parse starting stacks
-stacks = defaultdict(deque)
-# Left on deque = top of stack, right = bottom
-for row in [list(chunks(x, 4)) for x in starting_stacks.split('\n')]:
-	for stack_idx, column in enumerate(row):
-		column = column.strip()
-		if column.isdigit():
-			assert int(column) == stack_idx + 1
-		elif column:
-			stacks[stack_idx + 1].append(column)
-
-# pprint.pprint(dict(stacks), width=120)
-
-for move in rearrangement_procedure.split('\n'):
-	# print(move)
-	match = re.match(r"^move (?P<qty>\d+) from (?P<from>\d+) to (?P<to>\d+)$", move)
-	assert match is not None, move
-	move_data = {k: int(v) for k, v in match.groupdict().items()}
-	# print(move_data)
-	for _ in range(move_data["qty"]):
-		stacks[move_data["to"]].appendleft(stacks[move_data["from"]].popleft())
-	# pprint.pprint(dict(stacks), width=120)
-	# input(">")
-
-top_crates = ''.join(stacks[stack_idx + 1][0][1] for stack_idx in range(len(stacks)))
-print("After rearranging the crates, the top crates are:", top_crates)  # SPFMVDTZT
+# Parse starting stacks and the procedure
+moves = parse_procedure(rearrangement_procedure)
+stacks = parse_stacks(starting_stacks)
+
+# Each move takes a whole block of crates off the top of the stack at once
+rearrange(stacks, moves, CRATE_MOVER_9000)
+
+print("After rearranging the crates, the top crates are:", top_crates(stacks))  # SPFMVDTZT
 
 # === Part 2 ===
 """
@@ -147,32 +126,7 @@ Before the rearrangement process finishes, update your simulation so that the El
 """
 
 # Parse starting stacks again
-stacks = defaultdict(deque)
-# Left on deque = top of stack, right = bottom
-for row in [list(chunks(x, 4)) for x in starting_stacks.split('\n')]:
-	for stack_idx, column in enumerate(row):
-		column = column.strip()
-		if column.isdigit():
-			assert int(column) == stack_idx + 1
-		elif column:
-			stacks[stack_idx + 1].append(column)
-
-# pprint.pprint(dict(stacks), width=120)
-
-for move in rearrangement_procedure.split('\n'):
-	# print(move)
-	match = re.match(r"^move (?P<qty>\d+) from (?P<from>\d+) to (?P<to>\d+)$", move)
-	assert match is not None, move
-	move_data = {k: int(v) for k, v in match.groupdict().items()}
-	# print(move_data)
-	grabber = deque(maxlen=move_data["qty"])
-	for _ in range(move_data["qty"]):
-		grabber.append(stacks[move_data["from"]].popleft())
-	for _ in range(move_data["qty"]):
-		stacks[move_data["to"]].appendleft(grabber.pop())
-
-	# pprint.pprint(dict(stacks), width=120)
-	# input(">")
-
-top_crates = ''.join(stacks[stack_idx + 1][0][1] for stack_idx in range(len(stacks)))
-print("After rearranging the crates, the top crates are:", top_crates)  # ZFSJBPRFP
+stacks = parse_stacks(starting_stacks)
+rearrange(stacks, moves, CRATE_MOVER_9001)
+
+print("After rearranging the crates, the top crates are:", top_crates(stacks))  # ZFSJBPRFP
@@ -0,0 +1,457 @@
+"""
+Rearrangement of the stacks of crates by the giant cargo crane.
+
+Each stack is a list of crates from the bottom up, so the top of the stack is the end of the list,
+and each move takes the whole block of crates off the top of a stack as a single slice.
+
+When only the final top crates are needed, :func:`~.resolve_top_crates` instead works backwards
+through the procedure from the top of each stack to find where that crate started, without moving any crates.
+
+For very tall stacks, :class:`~.CrateStack` stores the crates as a rope of blocks, so a move splits and joins
+the ropes in logarithmic time rather than copying every crate.
+"""
+
+# stdlib
+import random
+import re
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+# 3rd party
+from domdf_python_tools.iterative import chunks
+
+__all__ = [
+		"CRATE_MOVER_9000",
+		"CRATE_MOVER_9001",
+		"CrateStack",
+		"Move",
+		"parse_procedure",
+		"parse_stacks",
+		"rearrange",
+		"rearrange_crate_stacks",
+		"resolve_top_crates",
+		"top_crates",
+		]
+
+#: The crane model which moves one crate at a time, so a block of crates ends up in reverse order.
+CRATE_MOVER_9000 = 9000
+
+#: The crane model which moves several crates at once, so a block of crates keeps its order.
+CRATE_MOVER_9001 = 9001
+
+_MOVE_RE = re.compile(r"^move (?P<qty>\d+) from (?P<from>\d+) to (?P<to>\d+)$")
+
+
+class Move(NamedTuple):
+	"""
+	A step of the rearrangement procedure.
+	"""
+
+	#: The number of crates to move.
+	quantity: int
+
+	#: The number of the stack to take the crates from.
+	source: int
+
+	#: The number of the stack to put the crates on.
+	destination: int
+
+
+def parse_stacks(starting_stacks: str) -> Dict[int, List[str]]:
+	"""
+	Parse the drawing of the starting stacks.
+
+	:param starting_stacks:
+
+	:returns: A mapping of stack numbers to the crates in each stack, from the bottom up.
+	"""
+
+	rows = starting_stacks.split('\n')
+	stack_numbers = rows[-1].split()
+	stacks: Dict[int, List[str]] = {int(number): [] for number in stack_numbers}
+
+	for row in reversed(rows[:-1]):
+		for stack_idx, column in enumerate(chunks(row, 4)):
+			column = column.strip()
+			if column:
+				stacks[stack_idx + 1].append(column[1])
+
+	return stacks
+
+
+def parse_procedure(rearrangement_procedure: str) -> List[Move]:
+	"""
+	Parse the steps of the rearrangement procedure.
+
+	:param rearrangement_procedure:
+	"""
+
+	moves = []
+
+	for line in rearrangement_procedure.strip().split('\n'):
+		match = _MOVE_RE.match(line)
+		if match is None:
+			raise ValueError(f"Invalid move {line!r}")
+
+		moves.append(Move(int(match["qty"]), int(match["from"]), int(match["to"])))
+
+	return moves
+
+
+def _check_model(model: int) -> None:
+	if model not in {CRATE_MOVER_9000, CRATE_MOVER_9001}:
+		raise ValueError(f"Unknown crane model {model!r}")
+
+
+def rearrange(stacks: Dict[int, List[str]], moves: Iterable[Move], model: int = CRATE_MOVER_9000) -> None:
+	"""
+	Carry out the rearrangement procedure, modifying ``stacks`` in place.
+
+	Each move takes its crates off the source stack as one slice, so costs one slice copy
+	rather than one iteration per crate.
+
+	:param stacks: A mapping of stack numbers to the crates in each stack, from the bottom up.
+	:param moves:
+	:param model: The model of crane, either :py:data:`~.CRATE_MOVER_9000` or :py:data:`~.CRATE_MOVER_9001`.
+	"""
+
+	_check_model(model)
+	reverses = model == CRATE_MOVER_9000
+
+	for quantity, source, destination in moves:
+		if not quantity:
+			continue
+
+		source_stack = stacks[source]
+		if quantity > len(source_stack):
+			raise ValueError(f"Cannot move {quantity} crates from stack {source} of {len(source_stack)}")
+
+		block = source_stack[-quantity:]
+		del source_stack[-quantity:]
+
+		# Moving crates one at a time back onto the same stack leaves it unchanged.
+		if reverses and source != destination:
+			block.reverse()
+		stacks[destination].extend(block)
+
+
+def top_crates(stacks: Mapping[int, Sequence[str]]) -> str:
+	"""
+	Returns the crate on top of each stack, in order of stack number.
+
+	Empty stacks are shown as a space.
+
+	:param stacks: A mapping of stack numbers to the crates in each stack, from the bottom up.
+	"""
+
+	return ''.join(stacks[number][-1] if stacks[number] else ' ' for number in sorted(stacks))
+
+
+def resolve_top_crates(
+		stacks: Mapping[int, Sequence[str]],
+		moves: Sequence[Move],
+		model: int = CRATE_MOVER_9000,
+		) -> str:
+	"""
+	Returns the crate which would be on top of each stack after the rearrangement procedure,
+	without carrying out the procedure.
+
+	Starting from the top of each stack at the end, the procedure is walked in reverse to find
+	where that crate was originally. This costs ``O(moves × stacks)`` however many crates are moved.
+
+	:param stacks: A mapping of stack numbers to the crates in each stack, from the bottom up.
+		This is not modified.
+	:param moves:
+	:param model: The model of crane, either :py:data:`~.CRATE_MOVER_9000` or :py:data:`~.CRATE_MOVER_9001`.
+	"""
+
+	_check_model(model)
+	reverses = model == CRATE_MOVER_9000
+
+	# The height of each stack at the end, to find any which end up empty.
+	heights = {number: len(stack) for number, stack in stacks.items()}
+	for quantity, source, destination in moves:
+		if quantity > heights[source]:
+			raise ValueError(f"Cannot move {quantity} crates from stack {source} of {heights[source]}")
+		heights[source] -= quantity
+		heights[destination] += quantity
+
+	top = []
+
+	for number in sorted(stacks):
+		if not heights[number]:
+			top.append(' ')
+			continue
+
+		# The crate's position, as the stack it is in and how many crates are above it.
+		stack, depth = number, 0
+
+		for quantity, source, destination in reversed(moves):
+			if source == destination:
+				# Moving crates back onto the same stack leaves it unchanged, with either crane.
+				continue
+
+			if stack == destination:
+				if depth < quantity:
+					# The crate was part of this move.
+					stack = source
+					if reverses:
+						depth = quantity - 1 - depth
+				else:
+					depth -= quantity
+			elif stack == source:
+				depth += quantity
+
+		top.append(stacks[stack][-1 - depth])
+
+	return ''.join(top)
+
+
+class _Block:
+	"""
+	A block of crates in a :class:`~.CrateStack`, and the root of the subtree of blocks around it.
+
+	The block is a view of ``crates[start:stop]``, where ``crates`` may be shared with other blocks
+	but is never modified, so dividing a block makes two views rather than copying any crates.
+	"""
+
+	__slots__ = ("crates", "start", "stop", "backwards", "priority", "left", "right", "size", "flipped")
+
+	def __init__(self, crates: List[str], start: int, stop: int, backwards: bool = False):
+		self.crates = crates
+		self.start = start
+		self.stop = stop
+
+		#: Whether the block reads from ``crates[stop - 1]`` down to ``crates[start]``.
+		self.backwards = backwards
+
+		self.priority = random.random()
+		self.left: Optional[_Block] = None
+		self.right: Optional[_Block] = None
+
+		#: The number of crates in this subtree.
+		self.size = stop - start
+
+		#: Whether this subtree has been reversed, but the reversal not yet passed down to its children.
+		self.flipped = False
+
+	def __iter__(self) -> Iterator[str]:
+		if self.backwards:
+			return reversed(self.crates[self.start:self.stop])
+		else:
+			return iter(self.crates[self.start:self.stop])
+
+	def crate(self, index: int) -> str:
+		"""
+		Returns the crate at ``index`` within this block, from the bottom up.
+
+		:param index:
+		"""
+
+		if self.backwards:
+			return self.crates[self.stop - 1 - index]
+		else:
+			return self.crates[self.start + index]
+
+
+def _size(block: Optional[_Block]) -> int:
+	return block.size if block is not None else 0
+
+
+def _push(block: _Block) -> None:
+	# Pass a pending reversal down to the block's children.
+	if block.flipped:
+		block.left, block.right = block.right, block.left
+		block.backwards = not block.backwards
+		for child in (block.left, block.right):
+			if child is not None:
+				child.flipped = not child.flipped
+		block.flipped = False
+
+
+def _update(block: _Block) -> None:
+	block.size = block.stop - block.start + _size(block.left) + _size(block.right)
+
+
+def _split(block: Optional[_Block], count: int) -> Tuple[Optional[_Block], Optional[_Block]]:
+	# Divide the subtree into its bottom ``count`` crates and the rest.
+	if block is None:
+		return None, None
+
+	_push(block)
+	left_size = _size(block.left)
+
+	if count <= left_size:
+		lower, block.left = _split(block.left, count)
+		_update(block)
+		return lower, block
+
+	count -= left_size
+	length = block.stop - block.start
+
+	if count >= length:
+		block.right, upper = _split(block.right, count - length)
+		_update(block)
+		return block, upper
+
+	# The cut falls inside this block, so divide it into two views of the same crates.
+	# The upper view keeps the block's priority, so both halves are still valid treaps.
+	if block.backwards:
+		upper = _Block(block.crates, block.start, block.stop - count, backwards=True)
+		block.start = block.stop - count
+	else:
+		upper = _Block(block.crates, block.start + count, block.stop)
+		block.stop = block.start + count
+
+	upper.priority = block.priority
+	upper.right, block.right = block.right, None
+	_update(upper)
+	_update(block)
+
+	return block, upper
+
+
+def _merge(lower: Optional[_Block], upper: Optional[_Block]) -> Optional[_Block]:
+	# Join two subtrees, with all the crates of ``lower`` below those of ``upper``.
+	if lower is None:
+		return upper
+	if upper is None:
+		return lower
+
+	if lower.priority > upper.priority:
+		_push(lower)
+		lower.right = _merge(lower.right, upper)
+		_update(lower)
+		return lower
+	else:
+		_push(upper)
+		upper.left = _merge(lower, upper.left)
+		_update(upper)
+		return upper
+
+
+class CrateStack:
+	"""
+	A stack of crates stored as a rope of blocks, from the bottom up.
+
+	The blocks are the nodes of a randomised balanced tree (a treap), ordered from the bottom of the stack up,
+	and each block is a view of a list of crates which is never modified.
+	Taking the top ``k`` crates splits the tree, dividing at most one block into two views,
+	and putting them on another stack joins the two trees, so each costs ``O(log b)`` expected time,
+	where ``b`` is the number of blocks. A stack starts as a single block and each move adds at most one more.
+
+	Reversing the order of the crates, as the CrateMover 9000 does, is recorded with a flag on the root
+	and applied lazily as the tree is next walked, so it also does not touch every crate moved.
+
+	:param crates: The crates in the stack, from the bottom up.
+	"""
+
+	def __init__(self, crates: Iterable[str] = ()):
+		crates = list(crates)
+		self._root = _Block(crates, 0, len(crates)) if crates else None
+
+	def __len__(self) -> int:
+		return _size(self._root)
+
+	def __iter__(self) -> Iterator[str]:
+		# An in-order walk of the blocks, passing down reversals on the way.
+		pending = []
+		block = self._root
+
+		while pending or block is not None:
+			while block is not None:
+				_push(block)
+				pending.append(block)
+				block = block.left
+
+			block = pending.pop()
+			yield from block
+			block = block.right
+
+	def __getitem__(self, index: int) -> str:
+		size = len(self)
+		if index < 0:
+			index += size
+		if not 0 <= index < size:
+			raise IndexError("CrateStack index out of range")
+
+		block = self._root
+		while block is not None:
+			_push(block)
+			left_size = _size(block.left)
+			length = block.stop - block.start
+
+			if index < left_size:
+				block = block.left
+			elif index < left_size + length:
+				return block.crate(index - left_size)
+			else:
+				index -= left_size + length
+				block = block.right
+
+		raise AssertionError("unreachable")  # pragma: no cover
+
+	def __repr__(self) -> str:
+		return f"{self.__class__.__name__}({list(self)!r})"
+
+	def take(self, quantity: int) -> "CrateStack":
+		"""
+		Remove the top ``quantity`` crates from the stack.
+
+		:param quantity:
+
+		:returns: The removed crates, as a new stack.
+		"""
+
+		size = len(self)
+		if quantity > size:
+			raise ValueError(f"Cannot take {quantity} crates from a stack of {size}")
+
+		taken = CrateStack()
+		self._root, taken._root = _split(self._root, size - quantity)
+
+		return taken
+
+	def put(self, crates: "CrateStack") -> None:
+		"""
+		Put crates on top of the stack.
+
+		:param crates: The crates, which are moved to this stack, leaving ``crates`` empty.
+		"""
+
+		self._root = _merge(self._root, crates._root)
+		crates._root = None
+
+	def reverse(self) -> None:
+		"""
+		Reverse the order of the crates in the stack.
+		"""
+
+		if self._root is not None:
+			self._root.flipped = not self._root.flipped
+
+
+def rearrange_crate_stacks(
+		stacks: Dict[int, CrateStack],
+		moves: Iterable[Move],
+		model: int = CRATE_MOVER_9000,
+		) -> None:
+	"""
+	Carry out the rearrangement procedure on block-based stacks, modifying ``stacks`` in place.
+
+	:param stacks: A mapping of stack numbers to the stacks of crates.
+	:param moves:
+	:param model: The model of crane, either :py:data:`~.CRATE_MOVER_9000` or :py:data:`~.CRATE_MOVER_9001`.
+	"""
+
+	_check_model(model)
+	reverses = model == CRATE_MOVER_9000
+
+	for quantity, source, destination in moves:
+		if not quantity:
+			continue
+
+		crates = stacks[source].take(quantity)
+		if reverses and source != destination:
+			crates.reverse()
+
+		stacks[destination].put(crates)